@@ -2,9 +2,19 @@ import streamlit as st
 import pandas as pd
 from scholarly import scholarly
 import io
-from thefuzz import process, fuzz
+from rapidfuzz import process, fuzz, utils
 import os
+import math
+import threading
+import sqlite3
+import hashlib
+import json
+import time
+from contextlib import closing
+from itertools import islice
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 # --- 1. 페이지 설정 및 상수 정의 ---
 st.set_page_config(
@@ -16,55 +26,129 @@ st.set_page_config(
 MAX_RESULTS_LIMIT = 200
 MATCH_SCORE_THRESHOLD = 95
 TOP_JOURNAL_IF_THRESHOLD = 8.0
+VENUE_MATCH_CACHE_SIZE = 4096
+RESULTS_PAGE_SIZE = 25
+SCHOLAR_CACHE_TTL_SECONDS = 7 * 24 * 3600 # 같은 검색어의 Scholar 결과를 재사용하는 기간 (7일)
+IF_GRADE_EDGES = [0.2, 0.5, 1.0] # IF 등급 구간 경계 (왼쪽 포함: 하위/보통/양호/우수)
+IF_GRADE_STYLES = np.array([ # 등급 구간별 Impact Factor 셀 스타일
+    'color: red; font-weight: bold;', 'color: orange; font-weight: bold;',
+    'color: blue; font-weight: bold;', 'color: green; font-weight: bold;'
+], dtype=object)
 
 JOURNAL_DATA_FILE = 'journal_impact_data_20250619_153150.csv'
+# read_journal_csv의 정리 방식이나 컬럼 구성이 바뀌면 버전을 올려 기존 Feather 스냅샷을 무효화
+JOURNAL_SNAPSHOT_VERSION = 2
+JOURNAL_SNAPSHOT_COLUMNS = ['journal_title', 'impact_factor', 'journal_title_upper', 'impact_factor_numeric']
+CACHE_DB_FILE = 'citesee_cache.sqlite' # 저널명 매칭·Scholar 검색 결과 영구 캐시 (재시작·세션 간 공유)
+# 다운로드 파일명에 쓸 수 없는 문자 치환표 (검색어를 한 번의 순회로 변환)
+FILENAME_TRANSLATION_TABLE = str.maketrans({' ': '_', ':': '', '/': '_', '\\': '_', '"': ''})
 
 # --- 2. 핵심 함수 (데이터 로딩, 매칭, 스타일링) ---
-@st.cache_data
+def get_trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def read_journal_csv(file_path):
+    """저널 CSV를 읽어 정리된 DataFrame(대문자 저널명, 숫자형 IF 컬럼 포함)을 반환합니다."""
+    df = pd.read_csv(
+        file_path, encoding='utf-8-sig', engine='pyarrow',
+        usecols=['journal_title', 'impact_factor'], dtype={'journal_title': str}
+    ) # 필요한 컬럼만 pyarrow(C++) 파서로 읽음
+    df.dropna(subset=['journal_title', 'impact_factor'], inplace=True)
+    df['journal_title_upper'] = df['journal_title'].astype(str).str.upper() # 대문자 컬럼 추가
+
+    # 숫자형 IF 컬럼 추가: '<0.1'은 0.05로, 숫자로 바꿀 수 없는 값은 NaN으로 한 번에 변환
+    impact_factor = df['impact_factor']
+    if not pd.api.types.is_numeric_dtype(impact_factor): # '<0.1' 등 문자열이 섞여 있으면 object 컬럼으로 읽힘
+        impact_factor = impact_factor.astype(str).str.strip()
+        impact_factor = pd.to_numeric(impact_factor.mask(impact_factor.eq('<0.1'), '0.05'), errors='coerce')
+    df['impact_factor_numeric'] = impact_factor.astype(float)
+    df.dropna(subset=['impact_factor_numeric'], inplace=True)
+    return df.reset_index(drop=True)
+
+def read_journal_snapshot(snapshot_path, file_path):
+    """
+    CSV보다 최신인 Feather 스냅샷을 읽습니다.
+    없거나, 오래됐거나, 깨졌거나, 컬럼 구성이 다르면 None을 반환해 CSV를 다시 읽게 합니다.
+    """
+    try:
+        if os.path.getmtime(snapshot_path) < os.path.getmtime(file_path):
+            return None
+        df = pd.read_feather(snapshot_path)
+    except Exception: # 파일 없음, 쓰다 만 파일, 호환되지 않는 형식 등
+        return None
+    if list(df.columns) != JOURNAL_SNAPSHOT_COLUMNS or not pd.api.types.is_float_dtype(df['impact_factor_numeric']):
+        return None
+    return df
+
+def write_journal_snapshot(df, snapshot_path):
+    """Feather 스냅샷을 임시 파일에 쓴 뒤 한 번에 교체합니다. (중간에 실패해도 깨진 스냅샷이 남지 않음)"""
+    tmp_path = f"{snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, snapshot_path)
+    except Exception: # 읽기 전용 배포 환경, 디스크 부족 등에서는 스냅샷 없이 진행
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+@st.cache_resource # 불변 DB와 인덱스를 재실행·세션 간에 복사(pickle) 없이 참조로 공유
 def load_journal_db(file_path=JOURNAL_DATA_FILE):
     if not os.path.exists(file_path):
-        return None, None
+        return None, None, None, None, None, None, None
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        df.dropna(subset=['journal_title', 'impact_factor'], inplace=True)
-        df['journal_title_upper'] = df['journal_title'].astype(str).str.upper() # 대문자 컬럼 추가
-
-        def convert_if(value):
-            if isinstance(value, str) and value.strip() == '<0.1':
-                return 0.05
-            try:
-                return float(value)
-            except ValueError:
-                return np.nan
-        df['impact_factor_numeric'] = df['impact_factor'].apply(convert_if) # 숫자형 IF 컬럼 추가
-        df.dropna(subset=['impact_factor_numeric'], inplace=True)
-        return df, df['journal_title_upper'].tolist() # 대문자 저널명 리스트 반환
+        # 정리된 DB를 CSV 옆에 Feather 스냅샷으로 저장해 두고, CSV보다 최신이면 파싱 없이 바로 읽음
+        snapshot_path = f"{os.path.splitext(file_path)[0]}.v{JOURNAL_SNAPSHOT_VERSION}.feather"
+        df = read_journal_snapshot(snapshot_path, file_path)
+        if df is None:
+            df = read_journal_csv(file_path)
+            write_journal_snapshot(df, snapshot_path)
+        # 저널명 컬럼은 pyarrow 문자열로 연속 저장해 메모리를 줄임
+        df = df.astype({'journal_title': 'string[pyarrow]', 'journal_title_upper': 'string[pyarrow]'})
+        # 대문자 저널명 -> (IF, 원본 저널명) 조회용 딕셔너리 (중복 저널은 첫 번째 행 기준)
+        unique_df = df.drop_duplicates(subset='journal_title_upper')
+        journal_lookup = dict(zip(
+            unique_df['journal_title_upper'],
+            zip(unique_df['impact_factor_numeric'], unique_df['journal_title'])
+        ))
+        journal_names_upper = df['journal_title_upper'].tolist() # 대문자 저널명 리스트
+        # 퍼지 매칭용 전처리(default_process)는 로딩 시 한 번만 수행
+        journal_names_processed = [utils.default_process(name) for name in journal_names_upper]
+        # 전처리된 저널명 -> 첫 번째 인덱스 (완전 일치 시 퍼지 매칭 없이 바로 찾기 위함)
+        journal_index = {}
+        for idx, name in enumerate(journal_names_processed):
+            journal_index.setdefault(name, idx)
+        # 영구 캐시 키: 매칭 결과(최유사 후보, 점수)는 저널명 목록(순서 포함)에만 의존하므로 그 해시를 사용
+        # (CSV를 같은 이름으로 교체해도 저널명이 바뀌면 이전 매칭 결과를 쓰지 않음)
+        journal_db_key = hashlib.sha256('\n'.join(journal_names_upper).encode('utf-8')).hexdigest()
+        # 3-gram -> 해당 3-gram을 포함하는 저널명 인덱스 집합 (퍼지 매칭 후보 축소용)
+        trigram_index = {}
+        for idx, name in enumerate(journal_names_processed):
+            for trigram in get_trigrams(name):
+                trigram_index.setdefault(trigram, set()).add(idx)
+        return df, journal_names_upper, journal_names_processed, journal_index, trigram_index, journal_lookup, journal_db_key
     except Exception as e:
         st.error(f"데이터 파일({file_path}) 로드 오류: {e}")
-        return None, None
+        return None, None, None, None, None, None, None
+
+def get_length_window(query_length):
+    """fuzz.ratio가 (MATCH_SCORE_THRESHOLD - 0.5) 이상이 될 수 있는 후보 문자열 길이 범위를 반환합니다."""
+    cutoff = (MATCH_SCORE_THRESHOLD - 0.5) / 100
+    min_len = math.ceil(query_length * cutoff / (2 - cutoff) - 1e-9)
+    max_len = math.floor(query_length * (2 - cutoff) / cutoff + 1e-9)
+    return min_len, max_len
 
-@st.cache_data
-def get_journal_info_with_log(venue_from_scholar, db_df, journal_names_list_upper):
+def build_match_result(scholar_venue_processed, best_db_candidate_upper, score, journal_lookup):
     """
-    저널명 매칭을 시도하고, Impact Factor와 함께 매칭 시도 로그를 반환합니다.
+    퍼지 매칭 결과(최유사 후보, 점수)로 Impact Factor와 매칭 로그 튜플을 만듭니다.
     반환: (if_float, db_matched_journal_original_case, scholar_venue_processed, best_db_candidate_upper, score)
     매칭 실패 시 if_float는 np.nan, db_matched_journal_original_case는 "DB 매칭 실패"
     """
-    if not venue_from_scholar or db_df is None or not journal_names_list_upper:
-        return np.nan, "N/A", str(venue_from_scholar), "N/A", 0
-
-    scholar_venue_processed = str(venue_from_scholar).strip().upper()
-    if not scholar_venue_processed:
-        return np.nan, "N/A", str(venue_from_scholar), "N/A", 0
-
-    best_db_candidate_upper, score = process.extractOne(scholar_venue_processed, journal_names_list_upper, scorer=fuzz.ratio)
-
     if score >= MATCH_SCORE_THRESHOLD:
-        # 매칭된 대문자 DB 저널명으로 원본 DB 데이터에서 IF와 원본 저널명(대소문자 유지)을 찾음
-        matched_row = db_df.loc[db_df['journal_title_upper'] == best_db_candidate_upper]
-        if not matched_row.empty:
-            if_float = matched_row['impact_factor_numeric'].iloc[0]
-            db_matched_journal_original_case = matched_row['journal_title'].iloc[0] # 원본 케이스 저널명
+        # 매칭된 대문자 DB 저널명으로 IF와 원본 저널명(대소문자 유지)을 찾음
+        matched = journal_lookup.get(best_db_candidate_upper)
+        if matched is not None:
+            if_float, db_matched_journal_original_case = matched # 원본 케이스 저널명
             return if_float, db_matched_journal_original_case, scholar_venue_processed, best_db_candidate_upper, score
         else: # 이 경우는 거의 발생하지 않아야 함
             return np.nan, "DB 조회 오류", scholar_venue_processed, best_db_candidate_upper, score
@@ -72,51 +156,226 @@ def get_journal_info_with_log(venue_from_scholar, db_df, journal_names_list_uppe
         # 매칭 실패 시에도, 가장 유사했던 후보와 점수는 로그용으로 반환
         return np.nan, "DB 매칭 실패", scholar_venue_processed, best_db_candidate_upper, score
 
+@st.cache_resource
+def get_venue_match_cache(journal_db_key):
+    """
+    저널 DB(journal_db_key)별로 전처리(default_process)된 저널명 -> (DB 최유사 후보, 점수) 캐시와 그 잠금(lock)을 반환합니다.
+    스크립트 재실행·세션 간에 공유되며, 최대 VENUE_MATCH_CACHE_SIZE개까지 오래된 항목부터 지웁니다.
+    """
+    return {}, threading.Lock()
 
-def classify_sjr(impact_factor_float):
-    if pd.isna(impact_factor_float):
-        return "N/A"
+def load_persisted_venue_matches(journal_db_key, venues):
+    """SQLite 캐시에서 저널명들의 (DB 최유사 후보, 점수)를 읽습니다. 캐시를 쓸 수 없으면 빈 dict를 반환합니다."""
+    if not venues:
+        return {}
     try:
-        score = float(impact_factor_float)
-        if score >= 1.0: return "우수"
-        elif 0.5 <= score < 1.0: return "양호"
-        elif 0.2 <= score < 0.5: return "보통"
-        else: return "하위"
-    except (ValueError, TypeError):
-        return "N/A"
-
-def color_sjr_score(val_float_or_str): # 입력이 숫자 또는 "N/A" 또는 "<0.1" 문자열일 수 있음
-    if isinstance(val_float_or_str, str):
-        if val_float_or_str == "N/A":
-            return 'color: grey;'
-        elif val_float_or_str == "<0.1":
-            score = 0.05
-        else: # 숫자로 된 문자열 (예: "8.000")
-            try:
-                score = float(val_float_or_str)
-            except ValueError:
-                return 'color: grey;'
-    elif pd.isna(val_float_or_str):
-        return 'color: grey;'
-    else: # float
-        score = val_float_or_str
-
+        with closing(sqlite3.connect(CACHE_DB_FILE)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS venue_match ("
+                "journal_db TEXT, venue TEXT, candidate TEXT, score INTEGER, PRIMARY KEY (journal_db, venue))"
+            )
+            rows = conn.execute(
+                f"SELECT venue, candidate, score FROM venue_match WHERE journal_db = ? AND venue IN ({','.join('?' * len(venues))})",
+                [journal_db_key, *venues]
+            ).fetchall()
+        return {venue: (candidate, score) for venue, candidate, score in rows}
+    except sqlite3.Error:
+        return {}
+
+def persist_venue_matches(journal_db_key, venue_matches):
+    """새로 계산한 (DB 최유사 후보, 점수)를 SQLite 캐시에 저장합니다. 저장할 수 없으면 조용히 넘어갑니다."""
+    if not venue_matches:
+        return
     try:
-        if score >= 1.0: color = 'green'
-        elif 0.5 <= score < 1.0: color = 'blue'
-        elif 0.2 <= score < 0.5: color = 'orange'
-        else: color = 'red' # 0.05 (<0.1)도 여기에 포함
-        return f'color: {color}; font-weight: bold;'
-    except (ValueError, TypeError): # 혹시 모를 다른 타입 에러 방지
-        return 'color: grey;'
+        with closing(sqlite3.connect(CACHE_DB_FILE)) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO venue_match (journal_db, venue, candidate, score) VALUES (?, ?, ?, ?)",
+                [(journal_db_key, venue, candidate, score) for venue, (candidate, score) in venue_matches.items()]
+            )
+    except sqlite3.Error:
+        pass
+
+def get_journal_infos_with_log(venues_from_scholar, journal_lookup, journal_names_list_upper, journal_names_processed, journal_index, trigram_index, journal_db_key):
+    """
+    검색 결과의 저널명 전체를 매칭합니다. 이전에 매칭한 저널명은 메모리·SQLite 캐시에서 바로 가져옵니다.
+    DB에 그대로 있는 저널명은 점수 계산 없이 100점으로 처리하고, 나머지는 3-gram을 공유하는 후보만 점수를 매기고, 임계값에 못 미친 저널명만 전체 DB와 일괄 비교합니다.
+    (임계값 이상 유사한 저널명은 반드시 3-gram을 공유하므로 매칭 결과는 전체 비교와 동일)
+    반환: 입력 순서대로 build_match_result 튜플의 리스트
+    """
+    results = [(np.nan, "N/A", str(venue), "N/A", 0) for venue in venues_from_scholar]
+    if not journal_lookup or not journal_names_list_upper:
+        return results
+
+    # 처리된(대문자) 저널명별로 입력 위치를 모아 중복 저널은 한 번만 매칭
+    positions_by_venue = {}
+    for i, venue in enumerate(venues_from_scholar):
+        scholar_venue_processed = str(venue).strip().upper() if venue else ""
+        if scholar_venue_processed:
+            positions_by_venue.setdefault(scholar_venue_processed, []).append(i)
+
+    # 매칭 결과는 전처리(default_process)된 쿼리에만 의존하므로 캐시 키도 쿼리로 통일
+    # ("Nature." / "nature" 등 대소문자·구두점만 다른 저널명이 같은 캐시 항목을 공유)
+    query_by_venue = {v: utils.default_process(v) for v in positions_by_venue}
+    queries = list(dict.fromkeys(query_by_venue.values()))
+
+    # 캐시에는 임계값과 무관한 전체 DB 기준 최유사 후보와 점수만 저장하고, 임계값 판정은 매번 build_match_result에서 수행
+    venue_cache, venue_cache_lock = get_venue_match_cache(journal_db_key)
+    with venue_cache_lock:
+        query_matches = {q: venue_cache[q] for q in queries if q in venue_cache}
+    query_matches.update(load_persisted_venue_matches(journal_db_key, [q for q in queries if q not in query_matches]))
+    new_matches = {}
+
+    def set_match(query, idx, score):
+        new_matches[query] = (journal_names_list_upper[idx], round(float(score))) # thefuzz와 동일하게 정수 점수 사용
+
+    # 후보 저널명은 이미 전처리되어 있으므로 processor는 생략
+    unmatched_queries = []
+    for query in queries:
+        if query in query_matches:
+            continue
+        exact_idx = journal_index.get(query)
+        if exact_idx is not None: # 완전 일치: 첫 번째 일치 항목이 전체 비교 결과와 동일
+            set_match(query, exact_idx, 100)
+            continue
+        candidate_idx = set().union(*(trigram_index.get(t, ()) for t in get_trigrams(query)))
+        # ratio <= 2*min(len)/(len 합)이므로 길이 차이가 커서 임계값에 도달할 수 없는 후보는 제외
+        min_len, max_len = get_length_window(len(query))
+        candidate_idx = {i for i in candidate_idx if min_len <= len(journal_names_processed[i]) <= max_len}
+        if candidate_idx:
+            # 인덱스 순서대로 넘겨 동점일 때 전체 비교와 같은 후보를 고름
+            # score_cutoff로 반올림 후 임계값에 못 미칠 후보는 rapidfuzz 내부에서 조기 종료
+            best = process.extractOne(
+                query, {i: journal_names_processed[i] for i in sorted(candidate_idx)},
+                scorer=fuzz.ratio, processor=None, score_cutoff=MATCH_SCORE_THRESHOLD - 0.5
+            )
+            if best is not None and round(best[1]) >= MATCH_SCORE_THRESHOLD:
+                _, score, idx = best
+                set_match(query, idx, score)
+                continue
+        unmatched_queries.append(query)
+
+    if unmatched_queries:
+        # 매칭 실패 로그에 전체 DB 기준 최유사 후보를 남기기 위해 나머지는 한 번에 일괄 점수 계산
+        scores = process.cdist(
+            unmatched_queries, journal_names_processed,
+            scorer=fuzz.ratio, processor=None, workers=-1
+        )
+        best_idx = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(unmatched_queries)), best_idx]
+        for query, idx, score in zip(unmatched_queries, best_idx, best_scores):
+            set_match(query, idx, score)
+
+    persist_venue_matches(journal_db_key, new_matches)
+    query_matches.update(new_matches)
+    with venue_cache_lock:
+        venue_cache.update(query_matches)
+        while len(venue_cache) > VENUE_MATCH_CACHE_SIZE:
+            venue_cache.pop(next(iter(venue_cache)))
+
+    for scholar_venue_processed, positions in positions_by_venue.items():
+        best_db_candidate_upper, score = query_matches[query_by_venue[scholar_venue_processed]]
+        match_result = build_match_result(scholar_venue_processed, best_db_candidate_upper, score, journal_lookup)
+        for i in positions:
+            results[i] = match_result
+    return results
+
+
+def classify_sjr_column(if_series):
+    """숫자형 IF 컬럼 전체의 등급을 한 번에 계산합니다. (구간은 왼쪽 포함, NaN은 "N/A", 결과는 범주형)"""
+    grades = pd.cut(
+        if_series, bins=[-np.inf, *IF_GRADE_EDGES, np.inf], labels=["하위", "보통", "양호", "우수"], right=False
+    )
+    return grades.cat.add_categories("N/A").fillna("N/A")
+
+def format_impact_factor(if_series):
+    """숫자형 IF 컬럼을 표시용 문자열 컬럼으로 변환합니다. (0.05는 "<0.1", NaN은 "N/A")"""
+    values = if_series.to_numpy(dtype=float)
+    formatted = np.char.mod('%.3f', values).astype(object)
+    formatted[values == 0.05] = "<0.1"
+    formatted[np.isnan(values)] = "N/A"
+    return pd.Series(formatted, index=if_series.index)
+
+def color_sjr_column(if_column, if_numeric):
+    """
+    Impact Factor 컬럼 전체의 CSS 스타일을 한 번에 계산합니다. (Styler.apply용)
+    표시용 문자열("N/A", "<0.1" 등)을 다시 파싱하지 않고 같은 인덱스의 숫자형 IF(if_numeric)로 판정합니다.
+    """
+    scores = if_numeric.loc[if_column.index].to_numpy(dtype=float)
+    # 구간 번호(0~3: <0.2, <0.5, <1.0, 그 이상)로 스타일 배열을 바로 인덱싱. 0.05 (<0.1)도 red에 포함
+    styles = IF_GRADE_STYLES[np.digitize(scores, IF_GRADE_EDGES)]
+    styles[np.isnan(scores)] = 'color: grey;'
+    return pd.Series(styles, index=if_column.index)
 
 
-@st.cache_data
-def convert_df_to_csv(df: pd.DataFrame):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        df_copy[col] = df_copy[col].astype(str)
-    return df_copy.to_csv(index=False).encode('utf-8-sig')
+def load_persisted_scholar_search(query, max_results):
+    """
+    SQLite 캐시에서 SCHOLAR_CACHE_TTL_SECONDS 이내에 저장된 검색 결과를 읽습니다. 없거나 캐시를 쓸 수 없으면 None을 반환합니다.
+    해석할 수 없는 항목(이전 형식 등)은 지우고 None을 반환해 다시 검색하게 합니다.
+    """
+    try:
+        with closing(sqlite3.connect(CACHE_DB_FILE)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scholar_search ("
+                "query TEXT, max_results INTEGER, fetched_at REAL, payload TEXT, PRIMARY KEY (query, max_results))"
+            )
+            row = conn.execute(
+                "SELECT payload FROM scholar_search WHERE query = ? AND max_results = ? AND fetched_at >= ?",
+                (query, max_results, time.time() - SCHOLAR_CACHE_TTL_SECONDS)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                payload = json.loads(row[0])
+                return payload['pubs'], bool(payload['is_truncated'])
+            except Exception: # JSON이 아니거나 구조가 다른 항목
+                with conn:
+                    conn.execute("DELETE FROM scholar_search WHERE query = ? AND max_results = ?", (query, max_results))
+                return None
+    except sqlite3.Error:
+        return None
+
+def persist_scholar_search(query, max_results, pubs, is_truncated):
+    """검색 결과를 JSON으로 SQLite 캐시에 저장합니다. 저장할 수 없으면 조용히 넘어갑니다."""
+    try:
+        # scholarly의 PublicationSource 등 str 기반 Enum은 문자열 값으로, 그 밖의 객체는 str()로 저장
+        payload = json.dumps({'pubs': pubs, 'is_truncated': is_truncated}, ensure_ascii=False, default=str)
+        with closing(sqlite3.connect(CACHE_DB_FILE)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scholar_search (query, max_results, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                (query, max_results, time.time(), payload)
+            )
+    except (sqlite3.Error, TypeError, ValueError):
+        pass
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def search_scholar_pubs(query, max_results=MAX_RESULTS_LIMIT):
+    """
+    Google Scholar에서 논문을 최대 max_results개까지 수집합니다. (같은 검색어는 메모리 1시간, SQLite 7일 동안 캐시)
+    IF 매칭 전의 원본 결과만 캐시하므로 저널 DB와 무관하게 재사용됩니다.
+    반환: (논문 dict 리스트, 결과가 max_results개를 넘어 잘렸는지 여부)
+    """
+    cached = load_persisted_scholar_search(query, max_results)
+    if cached is not None:
+        return cached
+    # 잘림 여부 확인을 위해 한 개를 더 받아 보고 max_results개로 자름
+    pubs = [dict(pub) for pub in islice(scholarly.search_pubs(query), max_results + 1)]
+    is_truncated = len(pubs) > max_results
+    del pubs[max_results:]
+    persist_scholar_search(query, max_results, pubs, is_truncated)
+    return pubs, is_truncated
+
+
+def get_results_page_key(active_search):
+    """검색 조건 (검색어, 필터 여부)별 결과 페이지 위젯의 session_state 키를 반환합니다."""
+    return f"results_page::{active_search!r}"
+
+def convert_df_to_csv(df: pd.DataFrame): # 검색마다 결과가 달라 캐시하지 않음 (DataFrame 해싱·캐시 메모리 절약)
+    # 혼합형 컬럼(예: 매칭 점수)도 Arrow로 변환되도록 문자열로 통일 (astype이 새 DataFrame을 만들므로 별도 copy 불필요)
+    # pyarrow(C++) CSV writer로 기록하고, 엑셀 호환을 위해 UTF-8 BOM을 직접 붙임
+    output = io.BytesIO()
+    output.write(b'\xef\xbb\xbf')
+    pa_csv.write_csv(pa.Table.from_pandas(df.astype(str), preserve_index=False), output)
+    return output.getvalue()
 
 
 # --- 3. UI 본문 구성 ---
@@ -128,7 +387,7 @@ Google Scholar에서 논문을 검색하고, Impact Factor를 함께 조회합
 **🏆 Top 저널 기준:** Impact Factor **{TOP_JOURNAL_IF_THRESHOLD}점 이상**인 저널.
 """)
 
-db_df, journal_names_upper_list = load_journal_db() # 이제 journal_names_upper_list는 대문자
+db_df, journal_names_upper_list, journal_names_processed, journal_index, trigram_index, journal_lookup, journal_db_key = load_journal_db() # 이제 journal_names_upper_list는 대문자
 if db_df is None:
     st.error(f"⚠️ `{JOURNAL_DATA_FILE}` 파일을 찾을 수 없습니다. 앱과 동일한 폴더에 해당 파일이 있는지 확인해주세요.")
 else:
@@ -159,25 +418,40 @@ else:
         query_parts = []
         if keyword: query_parts.append(keyword)
         if author: query_parts.append(f'author:"{author}"')
-        query = " ".join(query_parts)
+        # 페이지 이동 등 위젯 조작으로 재실행되어도 결과가 유지되도록 현재 검색 조건을 세션에 저장
+        active_search = (" ".join(query_parts), only_if_found)
+        st.session_state['active_search'] = active_search
+        st.session_state.pop(get_results_page_key(active_search), None) # 새로 검색하면 (같은 조건이어도) 1쪽부터 표시
+    elif submit_button and not (author or keyword):
+        st.session_state.pop('active_search', None)
+        st.warning("저자 또는 키워드 중 하나 이상을 입력해야 합니다.")
+
+    if 'active_search' in st.session_state:
+        query, only_if_found = st.session_state['active_search'] # 검색 결과·매칭 결과는 캐시되어 재실행 비용이 작음
 
         failed_matches_log = [] # 매칭 실패 로그를 저장할 리스트
 
         with st.spinner(f"'{query}' 조건으로 논문을 검색 중입니다..."):
             try:
-                search_query = scholarly.search_pubs(query)
-                results = []
-                for i, pub in enumerate(search_query):
-                    if i >= MAX_RESULTS_LIMIT:
-                        st.info(f"검색 결과가 많아 최대 {MAX_RESULTS_LIMIT}개까지만 표시합니다.")
-                        break
-
+                pubs, is_truncated = search_scholar_pubs(query, MAX_RESULTS_LIMIT)
+                if is_truncated:
+                    st.info(f"검색 결과가 많아 최대 {MAX_RESULTS_LIMIT}개까지만 표시합니다.")
+
+                # 수집한 논문의 저널명을 한 번에 일괄 매칭
+                venues_from_scholar = [pub.get('bib', {}).get('venue', 'N/A') for pub in pubs]
+                match_results = get_journal_infos_with_log(
+                    venues_from_scholar, journal_lookup, journal_names_upper_list, journal_names_processed, journal_index, trigram_index, journal_db_key
+                )
+
+                # 결과는 컬럼별 리스트(수집한 논문 수만큼 미리 할당)에 채운 뒤 한 번에 DataFrame으로 변환
+                result_columns = {col: [None] * len(pubs) for col in (
+                    "Top 저널", "제목 (Title)", "저자 (Authors)", "연도 (Year)", "저널명 (검색결과)",
+                    "DB 저널명 (매칭시)", "매칭 점수 (%)", "_Impact Factor_numeric", "피인용 수", "논문 링크"
+                )}
+                n_results = 0
+                for pub, venue_from_scholar, match_result in zip(pubs, venues_from_scholar, match_results):
                     bib = pub.get('bib', {})
-                    venue_from_scholar = bib.get('venue', 'N/A')
-
-                    if_float, db_matched_journal_original, scholar_venue_processed, best_db_candidate, score_val = get_journal_info_with_log(
-                        venue_from_scholar, db_df, journal_names_upper_list
-                    )
+                    if_float, db_matched_journal_original, scholar_venue_processed, best_db_candidate, score_val = match_result
 
                     # 상세 로그 기록 (점수가 0보다 크고 임계값 미만인 경우)
                     if pd.isna(if_float) and score_val > 0 and score_val < MATCH_SCORE_THRESHOLD :
@@ -196,30 +470,29 @@ else:
                     if not pd.isna(if_float) and if_float >= TOP_JOURNAL_IF_THRESHOLD:
                         top_journal_icon = "🏆"
                     
-                    results.append({
-                        "Top 저널": top_journal_icon,
-                        "제목 (Title)": bib.get('title', 'N/A'),
-                        "저자 (Authors)": ", ".join(bib.get('author', ['N/A'])),
-                        "연도 (Year)": bib.get('pub_year', 'N/A'),
-                        "저널명 (검색결과)": venue_from_scholar,
-                        "DB 저널명 (매칭시)": db_matched_journal_original,
-                        "매칭 점수 (%)": score_val if score_val > 0 else "N/A",
-                        "_Impact Factor_numeric": if_float, # 숫자형 IF는 내부 계산용으로 숨김 (또는 다른 이름)
-                        "Impact Factor": f"{if_float:.3f}" if not pd.isna(if_float) and if_float != 0.05 else ("<0.1" if if_float == 0.05 else "N/A"),
-                        "피인용 수": pub.get('num_citations', 0),
-                        "논문 링크": pub.get('pub_url', '#'),
-                    })
-
-                if not results:
+                    result_columns["Top 저널"][n_results] = top_journal_icon
+                    result_columns["제목 (Title)"][n_results] = bib.get('title', 'N/A')
+                    result_columns["저자 (Authors)"][n_results] = ", ".join(bib.get('author', ['N/A']))
+                    result_columns["연도 (Year)"][n_results] = bib.get('pub_year', 'N/A')
+                    result_columns["저널명 (검색결과)"][n_results] = venue_from_scholar
+                    result_columns["DB 저널명 (매칭시)"][n_results] = db_matched_journal_original
+                    result_columns["매칭 점수 (%)"][n_results] = score_val if score_val > 0 else "N/A"
+                    result_columns["_Impact Factor_numeric"][n_results] = if_float # 숫자형 IF는 내부 계산용으로 숨김 (또는 다른 이름)
+                    result_columns["피인용 수"][n_results] = pub.get('num_citations', 0)
+                    result_columns["논문 링크"][n_results] = pub.get('pub_url', '#')
+                    n_results += 1
+
+                if n_results == 0:
                     st.warning("조건에 맞는 논문이 없습니다. (필터를 해제하거나 다른 키워드를 시도해보세요)")
                 else:
-                    subheader_text = f"📊 검색 결과 ({len(results)}개)"
+                    subheader_text = f"📊 검색 결과 ({n_results}개)"
                     if only_if_found:
                         subheader_text += " - Impact Factor 정보가 있는 저널만 필터링됨"
                     st.subheader(subheader_text)
 
-                    df_results = pd.DataFrame(results)
-                    df_results['IF 등급'] = df_results['_Impact Factor_numeric'].apply(classify_sjr) # 숫자형 IF로 등급 계산
+                    df_results = pd.DataFrame({col: values[:n_results] for col, values in result_columns.items()})
+                    df_results['Impact Factor'] = format_impact_factor(df_results['_Impact Factor_numeric']) # 표시용 IF 문자열은 한 번에 변환
+                    df_results['IF 등급'] = classify_sjr_column(df_results['_Impact Factor_numeric']) # 숫자형 IF로 등급 계산
                     
                     df_display = df_results[[
                         "Top 저널", "제목 (Title)", "저자 (Authors)", "연도 (Year)",
@@ -227,8 +500,18 @@ else:
                         "피인용 수", "매칭 점수 (%)", "논문 링크"
                     ]]
 
+                    # 현재 페이지 구간만 스타일링·전송
+                    n_pages = math.ceil(len(df_display) / RESULTS_PAGE_SIZE)
+                    page = 1
+                    if n_pages > 1:
+                        page = st.number_input(
+                            f"페이지 (총 {n_pages}쪽, 쪽당 {RESULTS_PAGE_SIZE}개)", min_value=1, max_value=n_pages, value=1, step=1,
+                            key=get_results_page_key(st.session_state['active_search']) # 검색 조건별로 페이지 상태를 분리
+                        )
+                    df_page = df_display.iloc[(page - 1) * RESULTS_PAGE_SIZE : page * RESULTS_PAGE_SIZE]
+
                     st.dataframe(
-                        df_display.style.applymap(color_sjr_score, subset=['Impact Factor']),
+                        df_page.style.apply(color_sjr_column, subset=['Impact Factor'], if_numeric=df_results['_Impact Factor_numeric']),
                         use_container_width=True,
                         column_config={"논문 링크": st.column_config.LinkColumn("바로가기", display_text="🔗 Link")},
                         hide_index=True
@@ -238,7 +521,7 @@ else:
                     st.download_button(
                         label="📄 결과 CSV 파일로 다운로드",
                         data=csv_data,
-                        file_name=f'search_{query.replace(" ", "_").replace(":", "")}.csv',
+                        file_name=f'search_{query.translate(FILENAME_TRANSLATION_TABLE)}.csv',
                         mime='text/csv'
                     )
                 
@@ -250,7 +533,6 @@ else:
                     st.dataframe(df_failed_log, use_container_width=True, hide_index=True)
 
             except Exception as e:
+                st.session_state.pop('active_search', None) # 재실행마다 같은 오류로 재검색하지 않도록 초기화
                 st.error(f"검색 중 오류가 발생했습니다: {e}")
                 st.exception(e)
-    elif submit_button and not (author or keyword):
-        st.warning("저자 또는 키워드 중 하나 이상을 입력해야 합니다.")